@@ -7,6 +7,9 @@ from pr_insight.algo.types import EDIT_TYPE, FilePatchInfo
 from pr_insight.config_loader import get_settings
 from pr_insight.log import get_logger
 
+RE_HUNK_HEADER = re.compile(
+    r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@[ ]?(.*)")
+
 
 def extend_patch(original_file_str, patch_str, patch_extra_lines_before=0,
                  patch_extra_lines_after=0, filename: str = "") -> str:
@@ -63,8 +66,6 @@ def process_patch_lines(patch_str, original_file_str, patch_extra_lines_before,
 
     is_valid_hunk = True
     start1, size1, start2, size2 = -1, -1, -1, -1
-    RE_HUNK_HEADER = re.compile(
-        r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@[ ]?(.*)")
     try:
         for i,line in enumerate(patch_lines):
             if line.startswith('@@'):
@@ -195,8 +196,6 @@ def omit_deletion_hunks(patch_lines) -> str:
     added_patched = []
     add_hunk = False
     inside_hunk = False
-    RE_HUNK_HEADER = re.compile(
-        r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))?\ @@[ ]?(.*)")
 
     for line in patch_lines:
         if line.startswith('@@'):
@@ -211,10 +210,9 @@ def omit_deletion_hunks(patch_lines) -> str:
                 inside_hunk = True
         else:
             temp_hunk.append(line)
-            if line:
-                edit_type = line[0]
-                if edit_type == '+':
-                    add_hunk = True
+            # once a hunk is known to contain an addition, its remaining lines need no inspection
+            if not add_hunk and line.startswith('+'):
+                add_hunk = True
     if inside_hunk and add_hunk:
         added_patched.extend(temp_hunk)
 
@@ -245,8 +243,11 @@ def handle_patch_deletions(patch: str, original_file_content_str: str,
             get_logger().info(f"Processing file: {file_name}, minimizing deletion file")
         patch = None # file was deleted
     else:
-        patch_lines = patch.splitlines()
-        patch_new = omit_deletion_hunks(patch_lines)
+        if '+' in patch:
+            patch_new = omit_deletion_hunks(patch.splitlines())
+        else:
+            # no line can start with '+', so every hunk is a deletion hunk - skip splitting and scanning the patch
+            patch_new = ''
         if patch != patch_new:
             if get_settings().config.verbosity_level > 0:
                 get_logger().info(f"Processing file: {file_name}, hunks were deleted")
@@ -292,8 +293,6 @@ __old hunk__
 
     patch_with_lines_str = f"\n\n## File: '{file.filename.strip()}'\n"
     patch_lines = patch.splitlines()
-    RE_HUNK_HEADER = re.compile(
-        r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@[ ]?(.*)")
     new_content_lines = []
     old_content_lines = []
     match = None
@@ -368,8 +367,6 @@ def extract_hunk_lines_from_patch(patch: str, file_name, line_start, line_end, s
         patch_with_lines_str = f"\n\n## File: '{file_name.strip()}'\n\n"
         selected_lines = ""
         patch_lines = patch.splitlines()
-        RE_HUNK_HEADER = re.compile(
-            r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@[ ]?(.*)")
         match = None
         start1, size1, start2, size2 = -1, -1, -1, -1
         skip_hunk = False
@@ -1,8 +1,13 @@
 # Language Selection, source: https://github.com/bigcode-project/bigcode-dataset/blob/main/language_selection/programming-languages-to-file-extensions.json  # noqa E501
-from typing import Dict
+import heapq
+from operator import itemgetter
+from typing import Dict, Optional
 
 from pr_insight.config_loader import get_settings
 
+# (language_extension_map_org setting, its lowercase-keyed copy, extension -> language map)
+_language_extension_maps_cache = (None, {}, {})
+
 
 def filter_bad_extensions(files):
     # Bad Extensions, source: https://github.com/EleutherAI/github-downloader/blob/345e7c4cbb9e0dc8a0615fd995a08bf9d73b3fe6/download_repo_text.py  # noqa: E501
@@ -19,25 +24,57 @@ def is_valid_file(filename:str, bad_extensions=None) -> bool:
         bad_extensions = get_settings().bad_extensions.default
         if get_settings().config.use_extra_bad_extensions:
             bad_extensions += get_settings().bad_extensions.extra
-    return filename.split('.')[-1] not in bad_extensions
+    return filename.rpartition('.')[2] not in bad_extensions
+
+
+def _get_language_extension_maps():
+    global _language_extension_maps_cache
+    language_extension_map_org = get_settings().language_extension_map_org
+    if _language_extension_maps_cache[0] is not language_extension_map_org:
+        # the maps are rebuilt only when the active settings object changes (e.g. a new request context)
+        language_extension_map = {k.lower(): v for k, v in language_extension_map_org.items()}
+        extension_to_language = {}
+        for language, extensions in language_extension_map.items():
+            for ext in extensions:
+                extension_to_language[ext] = language
+        _language_extension_maps_cache = (language_extension_map_org, language_extension_map, extension_to_language)
+    return _language_extension_maps_cache
+
+
+def get_language_extension_map() -> Dict:
+    """
+    Return the language -> extensions map from the settings, keyed by lowercase language name.
+    """
+    return _get_language_extension_maps()[1]
 
 
-def sort_files_by_main_languages(languages: Dict, files: list):
+def get_extension_to_language_map() -> Dict:
     """
-    Sort files by their main language, put the files that are in the main language first and the rest files after
+    Return the extension -> lowercase language name map. If an extension belongs to several languages,
+    the last one in the settings wins.
+    """
+    return _get_language_extension_maps()[2]
+
+
+def sort_files_by_main_languages(languages: Dict, files: list, top_k: Optional[int] = None):
+    """
+    Sort files by their main language, put the files that are in the main language first and the rest files after.
+    If 'top_k' is given, only the 'top_k' largest languages are treated as main languages, and the files of the
+    other languages are put under "Other". The tools currently call it without 'top_k' (all languages).
     """
     # sort languages by their size
-    languages_sorted_list = [k for k, v in sorted(languages.items(), key=lambda item: item[1], reverse=True)]
+    if top_k is None:
+        languages_sorted = sorted(languages.items(), key=itemgetter(1), reverse=True)
+    else:
+        # same order as the full sort, without sorting the languages that are not needed
+        languages_sorted = heapq.nlargest(top_k, languages.items(), key=itemgetter(1))
+    languages_sorted_list = [k for k, v in languages_sorted]
     # languages_sorted = sorted(languages, key=lambda x: x[1], reverse=True)
     # get all extensions for the languages
     main_extensions = []
-    language_extension_map_org = get_settings().language_extension_map_org
-    language_extension_map = {k.lower(): v for k, v in language_extension_map_org.items()}
+    language_extension_map = get_language_extension_map()
     for language in languages_sorted_list:
-        if language.lower() in language_extension_map:
-            main_extensions.append(language_extension_map[language.lower()])
-        else:
-            main_extensions.append([])
+        main_extensions.append(language_extension_map.get(language.lower(), []))
 
     # filter out files bad extensions
     files_filtered = filter_bad_extensions(files)
@@ -51,19 +88,26 @@ def sort_files_by_main_languages(languages: Dict, files: list):
         files_sorted = [({"language": "Other", "files": list(files_filtered)})]
         return files_sorted
 
-    main_extensions_flat = []
-    for ext in main_extensions:
-        main_extensions_flat.extend(ext)
-
-    for extensions, lang in zip(main_extensions, languages_sorted_list):  # noqa: B905
-        tmp = []
-        for file in files_filtered:
-            extension_str = f".{file.filename.split('.')[-1]}"
-            if extension_str in extensions:
-                tmp.append(file)
-            else:
-                if (file.filename not in rest_files) and (extension_str not in main_extensions_flat):
-                    rest_files[file.filename] = file
+    # index the main languages by extension, so that each file is looked up once instead of once per language.
+    # an extension can belong to more than one main language (e.g. '.h'), so it maps to a list of language indices
+    extension_to_language_indices = {}
+    for language_index, extensions in enumerate(main_extensions):
+        for ext in extensions:
+            language_indices = extension_to_language_indices.setdefault(ext, [])
+            if not language_indices or language_indices[-1] != language_index:
+                language_indices.append(language_index)
+
+    files_by_language = [[] for _ in languages_sorted_list]
+    for file in files_filtered:
+        extension_str = f".{file.filename.rpartition('.')[2]}"
+        language_indices = extension_to_language_indices.get(extension_str)
+        if language_indices:
+            for language_index in language_indices:
+                files_by_language[language_index].append(file)
+        elif file.filename not in rest_files:
+            rest_files[file.filename] = file
+
+    for lang, tmp in zip(languages_sorted_list, files_by_language):  # noqa: B905
         if len(tmp) > 0:
             files_sorted.append({"language": lang, "files": tmp})
     files_sorted.append({"language": "Other", "files": list(rest_files.values())})
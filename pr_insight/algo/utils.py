@@ -23,12 +23,20 @@ from pydantic import BaseModel
 from starlette_context import context
 
 from pr_insight.algo import MAX_TOKENS
-from pr_insight.algo.git_patch_processing import extract_hunk_lines_from_patch
+from pr_insight.algo.git_patch_processing import (RE_HUNK_HEADER,
+                                                 extract_hunk_lines_from_patch)
+from pr_insight.algo.language_handler import get_extension_to_language_map
 from pr_insight.algo.token_handler import TokenEncoder
 from pr_insight.algo.types import FilePatchInfo
 from pr_insight.config_loader import get_settings, global_settings
 from pr_insight.log import get_logger
 
+try:
+    # optional C implementation of difflib.SequenceMatcher, with identical scoring
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
 
 def get_weak_model() -> str:
     if get_settings().get("config.model_weak"):
@@ -157,7 +165,7 @@ def convert_to_markdown_v2(output_data: dict,
                 value_int = int(value)
             else:
                 try:
-                    value_int = int(value.split(',')[0])
+                    value_int = int(value.partition(',')[0])
                 except ValueError:
                     continue
             blue_bars = '🔵' * value_int
@@ -424,33 +432,35 @@ def parse_code_suggestion(code_suggestion: dict, i: int = 0, gfm_supported: bool
     Returns:
         str: A string containing the markdown formatted text generated from the input dictionary.
     """
-    markdown_text = ""
+    # the output is accumulated in a list and joined once, instead of re-concatenating a growing string
+    markdown_parts = []
     if gfm_supported and 'relevant_line' in code_suggestion:
-        markdown_text += '<table>'
+        markdown_parts.append('<table>')
         for sub_key, sub_value in code_suggestion.items():
             try:
-                if sub_key.lower() == 'relevant_file':
+                sub_key_lower = sub_key.lower()
+                if sub_key_lower == 'relevant_file':
                     relevant_file = sub_value.strip('`').strip('"').strip("'")
-                    markdown_text += f"<tr><td>relevant file</td><td>{relevant_file}</td></tr>"
+                    markdown_parts.append(f"<tr><td>relevant file</td><td>{relevant_file}</td></tr>")
                     # continue
-                elif sub_key.lower() == 'suggestion':
-                    markdown_text += (f"<tr><td>{sub_key} &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</td>"
-                                      f"<td>\n\n<strong>\n\n{sub_value.strip()}\n\n</strong>\n</td></tr>")
-                elif sub_key.lower() == 'relevant_line':
-                    markdown_text += f"<tr><td>relevant line</td>"
+                elif sub_key_lower == 'suggestion':
+                    markdown_parts.append(f"<tr><td>{sub_key} &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;</td>"
+                                          f"<td>\n\n<strong>\n\n{sub_value.strip()}\n\n</strong>\n</td></tr>")
+                elif sub_key_lower == 'relevant_line':
+                    markdown_parts.append("<tr><td>relevant line</td>")
                     sub_value_list = sub_value.split('](')
                     relevant_line = sub_value_list[0].lstrip('`').lstrip('[')
                     if len(sub_value_list) > 1:
                         link = sub_value_list[1].rstrip(')').strip('`')
-                        markdown_text += f"<td><a href='{link}'>{relevant_line}</a></td>"
+                        markdown_parts.append(f"<td><a href='{link}'>{relevant_line}</a></td>")
                     else:
-                        markdown_text += f"<td>{relevant_line}</td>"
-                    markdown_text += "</tr>"
+                        markdown_parts.append(f"<td>{relevant_line}</td>")
+                    markdown_parts.append("</tr>")
             except Exception as e:
                 get_logger().exception(f"Failed to parse code suggestion: {e}")
                 pass
-        markdown_text += '</table>'
-        markdown_text += "<hr>"
+        markdown_parts.append('</table>')
+        markdown_parts.append("<hr>")
     else:
         for sub_key, sub_value in code_suggestion.items():
             if isinstance(sub_key, str):
@@ -458,22 +468,25 @@ def parse_code_suggestion(code_suggestion: dict, i: int = 0, gfm_supported: bool
             if isinstance(sub_value,str):
                 sub_value = sub_value.rstrip()
             if isinstance(sub_value, dict):  # "code example"
-                markdown_text += f"  - **{sub_key}:**\n"
+                markdown_parts.append(f"  - **{sub_key}:**\n")
                 for code_key, code_value in sub_value.items():  # 'before' and 'after' code
                     code_str = f"```\n{code_value}\n```"
                     code_str_indented = textwrap.indent(code_str, '        ')
-                    markdown_text += f"    - **{code_key}:**\n{code_str_indented}\n"
+                    markdown_parts.append(f"    - **{code_key}:**\n{code_str_indented}\n")
             else:
-                if "relevant_file" in sub_key.lower():
-                    markdown_text += f"\n  - **{sub_key}:** {sub_value}  \n"
+                sub_key_lower = sub_key.lower()
+                if "relevant_file" in sub_key_lower:
+                    markdown_parts.append(f"\n  - **{sub_key}:** {sub_value}  \n")
                 else:
-                    markdown_text += f"   **{sub_key}:** {sub_value}  \n"
-                if "relevant_line" not in sub_key.lower():  # nicer presentation
-                    # markdown_text = markdown_text.rstrip('\n') + "\\\n" # works for gitlab
-                    markdown_text = markdown_text.rstrip('\n') + "   \n"  # works for gitlab and bitbucker
+                    markdown_parts.append(f"   **{sub_key}:** {sub_value}  \n")
+                if "relevant_line" not in sub_key_lower:  # nicer presentation
+                    # the part that was just added never consists of newlines only, so stripping it is the same
+                    # as stripping the whole text
+                    # markdown_parts[-1] = markdown_parts[-1].rstrip('\n') + "\\\n" # works for gitlab
+                    markdown_parts[-1] = markdown_parts[-1].rstrip('\n') + "   \n"  # works for gitlab and bitbucker
 
-        markdown_text += "\n"
-    return markdown_text
+        markdown_parts.append("\n")
+    return ''.join(markdown_parts)
 
 
 def try_fix_json(review, max_iter=10, code_suggestions=False):
@@ -663,6 +676,8 @@ def load_yaml(response_text: str, keys_fix_yaml: List[str] = [], first_key="", l
     return data
 
 
+YAML_SNIPPET_PATTERN = re.compile(r'```(yaml)?[\s\S]*?```')
+
 
 def try_fix_yaml(response_text: str,
                  keys_fix_yaml: List[str] = [],
@@ -671,14 +686,19 @@ def try_fix_yaml(response_text: str,
     response_text_lines = response_text.split('\n')
 
     keys_yaml = ['relevant line:', 'suggestion content:', 'relevant file:', 'existing code:', 'improved code:']
-    keys_yaml = keys_yaml + keys_fix_yaml
+    keys_yaml = keys_yaml + list(keys_fix_yaml)
     # first fallback - try to convert 'relevant line: ...' to relevant line: |-\n        ...'
+    # a single pattern finds the lines that contain any of the keys. only the first key (in 'keys_yaml' order) is
+    # replaced in each line, since the replacement adds a '|' to the line
+    keys_yaml_pattern = re.compile('|'.join(map(re.escape, keys_yaml)))
     response_text_lines_copy = response_text_lines.copy()
-    for i in range(0, len(response_text_lines_copy)):
+    for i, line in enumerate(response_text_lines_copy):
+        if '|' in line or not keys_yaml_pattern.search(line):
+            continue
         for key in keys_yaml:
-            if key in response_text_lines_copy[i] and not '|' in response_text_lines_copy[i]:
-                response_text_lines_copy[i] = response_text_lines_copy[i].replace(f'{key}',
-                                                                                  f'{key} |\n        ')
+            if key in line:
+                response_text_lines_copy[i] = line.replace(f'{key}', f'{key} |\n        ')
+                break
     try:
         data = yaml.safe_load('\n'.join(response_text_lines_copy))
         get_logger().info(f"Successfully parsed AI prediction after adding |-\n")
@@ -687,8 +707,7 @@ def try_fix_yaml(response_text: str,
         get_logger().info(f"Failed to parse AI prediction after adding |-\n")
 
     # second fallback - try to extract only range from first ```yaml to ````
-    snippet_pattern = r'```(yaml)?[\s\S]*?```'
-    snippet = re.search(snippet_pattern, '\n'.join(response_text_lines_copy))
+    snippet = YAML_SNIPPET_PATTERN.search('\n'.join(response_text_lines_copy))
     if snippet:
         snippet_text = snippet.group()
         try:
@@ -869,6 +888,98 @@ def replace_code_tags(text):
     return ''.join(parts)
 
 
+def _find_single_close_match(word: str, possibilities: List[str], cutoff: float) -> str | None:
+    """
+    Return the only string in 'possibilities' whose similarity ratio to 'word' is at least 'cutoff',
+    or None if there is no such string, or more than one.
+    Scored like difflib.get_close_matches (without autojunk), but the scan stops as soon as a second match is found.
+    """
+    # autojunk is disabled: for lines of 200+ characters its 'popular character' heuristic treats most characters
+    # as junk, which makes the ratio of near-identical lines collapse far below the cutoff
+    matcher = SequenceMatcher(autojunk=False)
+    matcher.set_seq2(word)  # difflib caches information about the second sequence, so it is the fixed one
+    len_word = len(word)
+    match = None
+    for possibility in possibilities:
+        # same upper bound as real_quick_ratio(), computed before paying for set_seq1()
+        total_len = len_word + len(possibility)
+        if total_len and 2.0 * min(len_word, len(possibility)) / total_len < cutoff:
+            continue
+        matcher.set_seq1(possibility)
+        if matcher.quick_ratio() >= cutoff and matcher.ratio() >= cutoff:
+            if match is not None:
+                return None
+            match = possibility
+    return match
+
+
+def _find_line_number_in_patch_lines(patch_lines: List[str],
+                                     relevant_line_in_file: str,
+                                     absolute_position: int) -> Tuple[int, int]:
+    """
+    Find the position of 'relevant_line_in_file' (or of 'absolute_position', if it is not -1) in the lines of a
+    single file patch. Returns (-1, absolute_position) if the line is not found.
+    """
+    position = -1
+    delta = 0
+    start1, size1, start2, size2 = 0, 0, 0, 0
+    if absolute_position != -1: # matching absolute to relative
+        for i, line in enumerate(patch_lines):
+            # new hunk
+            if line.startswith('@@'):
+                delta = 0
+                match = RE_HUNK_HEADER.match(line)
+                start1, size1, start2, size2 = map(int, match.groups()[:4])
+            elif not line.startswith('-'):
+                delta += 1
+
+            #
+            absolute_position_curr = start2 + delta - 1
+
+            if absolute_position_curr == absolute_position:
+                position = i
+                break
+    else:
+        # try to find the line in the patch using difflib, with some margin of error.
+        # if the line appears verbatim in the patch, the only possible fuzzy match is the line itself
+        if relevant_line_in_file not in patch_lines:
+            match_difflib = _find_single_close_match(relevant_line_in_file, patch_lines, cutoff=0.93)
+            if match_difflib is not None and match_difflib.startswith('+'):
+                relevant_line_in_file = match_difflib
+
+
+        for i, line in enumerate(patch_lines):
+            if line.startswith('@@'):
+                delta = 0
+                match = RE_HUNK_HEADER.match(line)
+                start1, size1, start2, size2 = map(int, match.groups()[:4])
+            elif not line.startswith('-'):
+                delta += 1
+
+            if relevant_line_in_file in line and line[0] != '-':
+                position = i
+                absolute_position = start2 + delta - 1
+                break
+
+        if position == -1 and relevant_line_in_file[0] == '+':
+            no_plus_line = relevant_line_in_file[1:].lstrip()
+            for i, line in enumerate(patch_lines):
+                if line.startswith('@@'):
+                    delta = 0
+                    match = RE_HUNK_HEADER.match(line)
+                    start1, size1, start2, size2 = map(int, match.groups()[:4])
+                elif not line.startswith('-'):
+                    delta += 1
+
+                if no_plus_line in line and line[0] != '-':
+                    # The model might add a '+' to the beginning of the relevant_line_in_file even if originally
+                    # it's a context line
+                    position = i
+                    absolute_position = start2 + delta - 1
+                    break
+    return position, absolute_position
+
+
 def find_line_number_of_relevant_line_in_file(diff_files: List[FilePatchInfo],
                                               relevant_file: str,
                                               relevant_line_in_file: str,
@@ -876,73 +987,20 @@ def find_line_number_of_relevant_line_in_file(diff_files: List[FilePatchInfo],
     position = -1
     if absolute_position is None:
         absolute_position = -1
-    re_hunk_header = re.compile(
-        r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@[ ]?(.*)")
 
     if not diff_files:
         return position, absolute_position
 
     for file in diff_files:
         if file.filename and (file.filename.strip() == relevant_file):
-            patch = file.patch
-            patch_lines = patch.splitlines()
-            delta = 0
-            start1, size1, start2, size2 = 0, 0, 0, 0
-            if absolute_position != -1: # matching absolute to relative
-                for i, line in enumerate(patch_lines):
-                    # new hunk
-                    if line.startswith('@@'):
-                        delta = 0
-                        match = re_hunk_header.match(line)
-                        start1, size1, start2, size2 = map(int, match.groups()[:4])
-                    elif not line.startswith('-'):
-                        delta += 1
-
-                    #
-                    absolute_position_curr = start2 + delta - 1
-
-                    if absolute_position_curr == absolute_position:
-                        position = i
-                        break
-            else:
-                # try to find the line in the patch using difflib, with some margin of error
-                matches_difflib: list[str | Any] = difflib.get_close_matches(relevant_line_in_file,
-                                                                             patch_lines, n=3, cutoff=0.93)
-                if len(matches_difflib) == 1 and matches_difflib[0].startswith('+'):
-                    relevant_line_in_file = matches_difflib[0]
-
-
-                for i, line in enumerate(patch_lines):
-                    if line.startswith('@@'):
-                        delta = 0
-                        match = re_hunk_header.match(line)
-                        start1, size1, start2, size2 = map(int, match.groups()[:4])
-                    elif not line.startswith('-'):
-                        delta += 1
-
-                    if relevant_line_in_file in line and line[0] != '-':
-                        position = i
-                        absolute_position = start2 + delta - 1
-                        break
-
-                if position == -1 and relevant_line_in_file[0] == '+':
-                    no_plus_line = relevant_line_in_file[1:].lstrip()
-                    for i, line in enumerate(patch_lines):
-                        if line.startswith('@@'):
-                            delta = 0
-                            match = re_hunk_header.match(line)
-                            start1, size1, start2, size2 = map(int, match.groups()[:4])
-                        elif not line.startswith('-'):
-                            delta += 1
-
-                        if no_plus_line in line and line[0] != '-':
-                            # The model might add a '+' to the beginning of the relevant_line_in_file even if originally
-                            # it's a context line
-                            position = i
-                            absolute_position = start2 + delta - 1
-                            break
+            file_position, file_absolute_position = _find_line_number_in_patch_lines(file.patch.splitlines(),
+                                                                                     relevant_line_in_file,
+                                                                                     absolute_position)
+            if file_position != -1:
+                position, absolute_position = file_position, file_absolute_position
     return position, absolute_position
 
+
 def get_rate_limit_status(github_token) -> dict:
     GITHUB_API_URL = get_settings(use_context=False).get("GITHUB.BASE_URL", "https://api.github.com").rstrip("/")  # "https://api.github.com"
     # GITHUB_API_URL = "https://api.github.com"
@@ -1004,12 +1062,15 @@ def validate_and_await_rate_limit(github_token):
 
 def github_action_output(output_data: dict, key_name: str):
     try:
+        # the data check is cheaper than the settings lookup, so it goes first
+        if not output_data:
+            return
         if not get_settings().get('github_action_config.enable_output', False):
             return
 
         key_data = output_data.get(key_name, {})
         with open(os.environ['GITHUB_OUTPUT'], 'a') as fh:
-            print(f"{key_name}={json.dumps(key_data, indent=None, ensure_ascii=False)}", file=fh)
+            print(f"{key_name}={json.dumps(key_data, ensure_ascii=False, separators=(',', ':'))}", file=fh)
     except Exception as e:
         get_logger().error(f"Failed to write to GitHub Action output: {e}")
     return
@@ -1171,13 +1232,9 @@ def set_file_languages(diff_files) -> List[FilePatchInfo]:
             return diff_files
 
         # map file extensions to programming languages
-        language_extension_map_org = get_settings().language_extension_map_org
-        extension_to_language = {}
-        for language, extensions in language_extension_map_org.items():
-            for ext in extensions:
-                extension_to_language[ext] = language
+        extension_to_language = get_extension_to_language_map()
         for file in diff_files:
-            extension_s = '.' + file.filename.rsplit('.')[-1]
+            extension_s = '.' + file.filename.rpartition('.')[2]
             language_name = "txt"
             if extension_s and (extension_s in extension_to_language):
                 language_name = extension_to_language[extension_s]
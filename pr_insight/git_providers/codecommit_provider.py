@@ -4,7 +4,8 @@ from collections import Counter
 from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
-from pr_insight.algo.language_handler import is_valid_file
+from pr_insight.algo.language_handler import (get_extension_to_language_map,
+                                               is_valid_file)
 from pr_insight.algo.types import EDIT_TYPE, FilePatchInfo
 from pr_insight.git_providers.codecommit_client import CodeCommitClient
 
@@ -13,6 +14,14 @@ from ..config_loader import get_settings
 from ..log import get_logger
 from .git_provider import GitProvider
 
+# Matches AWS console hostnames such as "us-east-1" or "us-gov-west-1" regions.
+# A pattern is used rather than a fixed list of regions so that newly launched regions keep validating.
+CODECOMMIT_HOSTNAME_PATTERN = re.compile(r"^[a-z]{2}-(gov-)?[a-z]+-\d\.console\.aws\.amazon\.com$")
+# A newline that is neither preceded nor followed by another newline
+SINGLE_NEWLINE_PATTERN = re.compile(r'(?<!\n)\n(?!\n)')
+# The collapsible-section tags that CodeCommit Markdown does not render
+COLLAPSIBLE_HTML_TAG_PATTERN = re.compile(r'</?(?:details|summary)>')
+
 
 class PullRequestCCMimic:
     """
@@ -267,13 +276,7 @@ class CodeCommitProvider(GitProvider):
         # where each dictionary item is a BoxList of extensions.
         # We want a dictionary of extensions,
         # where each dictionary item is a language name.
-        # We build that language->extension dictionary here in main_extensions_flat.
-        main_extensions_flat = {}
-        language_extension_map_org = get_settings().language_extension_map_org
-        language_extension_map = {k.lower(): v for k, v in language_extension_map_org.items()}
-        for language, extensions in language_extension_map.items():
-            for ext in extensions:
-                main_extensions_flat[ext] = language
+        main_extensions_flat = get_extension_to_language_map()
 
         # Map the file extension/languages to percentages
         languages = {}
@@ -359,7 +362,7 @@ class CodeCommitProvider(GitProvider):
         Returns:
         - bool: True if the hostname is valid, False otherwise.
         """
-        return re.match(r"^[a-z]{2}-(gov-)?[a-z]+-\d\.console\.aws\.amazon\.com$", hostname) is not None
+        return CODECOMMIT_HOSTNAME_PATTERN.match(hostname) is not None
 
     def _get_pr(self):
         response = self.codecommit_client.get_pr(self.repo_name, self.pr_num)
@@ -402,7 +405,7 @@ class CodeCommitProvider(GitProvider):
         Returns:
         - str: the PR body with the double newlines added
         """
-        return re.sub(r'(?<!\n)\n(?!\n)', '\n\n', body)
+        return SINGLE_NEWLINE_PATTERN.sub('\n\n', body)
 
     @staticmethod
     def _remove_markdown_html(comment: str) -> str:
@@ -418,11 +421,7 @@ class CodeCommitProvider(GitProvider):
         Returns:
         - str: the PR comment with the HTML tags removed
         """
-        comment = comment.replace("<details>", "")
-        comment = comment.replace("</details>", "")
-        comment = comment.replace("<summary>", "")
-        comment = comment.replace("</summary>", "")
-        return comment
+        return COLLAPSIBLE_HTML_TAG_PATTERN.sub('', comment)
 
     @staticmethod
     def _get_edit_type(codecommit_change_type: str):
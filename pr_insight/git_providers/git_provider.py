@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 # enum EDIT_TYPE (ADDED, DELETED, MODIFIED, RENAMED)
 from typing import Optional
 
+from pr_insight.algo.language_handler import get_language_extension_map
 from pr_insight.algo.types import FilePatchInfo
 from pr_insight.algo.utils import Range, process_description
 from pr_insight.config_loader import get_settings
@@ -285,13 +286,12 @@ def get_main_pr_language(languages, files) -> str:
                 continue
             if isinstance(file, str):
                 file = FilePatchInfo(base_file=None, head_file=None, patch=None, filename=file)
-            extension_list.append(file.filename.rsplit('.')[-1])
+            extension_list.append(file.filename.rpartition('.')[2])
 
         # get the most common extension
         most_common_extension = '.' + max(set(extension_list), key=extension_list.count)
         try:
-            language_extension_map_org = get_settings().language_extension_map_org
-            language_extension_map = {k.lower(): v for k, v in language_extension_map_org.items()}
+            language_extension_map = get_language_extension_map()
 
             if top_language in language_extension_map and most_common_extension in language_extension_map[top_language]:
                 main_language_str = top_language
@@ -27,6 +27,9 @@ from pr_insight.log import get_logger
 from pr_insight.servers.help import HelpMessage
 from pr_insight.tools.pr_description import insert_br_after_x_chars
 
+# keys used by 'try_fix_yaml' to repair a malformed code suggestions prediction
+CODE_SUGGESTIONS_KEYS_FIX_YAML = ("relevant_file", "suggestion_content", "existing_code", "improved_code")
+
 
 class PRCodeSuggestions:
     def __init__(self, pr_url: str, cli_mode=False, args: list = None,
@@ -491,17 +494,18 @@ class PRCodeSuggestions:
 
     def _prepare_pr_code_suggestions(self, predictions: str) -> Dict:
         data = load_yaml(predictions.strip(),
-                         keys_fix_yaml=["relevant_file", "suggestion_content", "existing_code", "improved_code"],
+                         keys_fix_yaml=CODE_SUGGESTIONS_KEYS_FIX_YAML,
                          first_key="code_suggestions", last_key="label")
         if isinstance(data, list):
             data = {'code_suggestions': data}
 
         # remove or edit invalid suggestions
         suggestion_list = []
-        one_sentence_summary_list = []
+        one_sentence_summary_set = set()
+        needed_keys = ('one_sentence_summary', 'label', 'relevant_file')
+        focus_only_on_problems = get_settings().get("pr_code_suggestions.focus_only_on_problems", False)
         for i, suggestion in enumerate(data['code_suggestions']):
             try:
-                needed_keys = ['one_sentence_summary', 'label', 'relevant_file']
                 is_valid_keys = True
                 for key in needed_keys:
                     if key not in suggestion:
@@ -512,12 +516,12 @@ class PRCodeSuggestions:
                 if not is_valid_keys:
                     continue
 
-                if get_settings().get("pr_code_suggestions.focus_only_on_problems", False):
+                if focus_only_on_problems:
                     CRITICAL_LABEL = 'critical'
                     if CRITICAL_LABEL in suggestion['label'].lower(): # we want the published labels to be less declarative
                         suggestion['label'] = 'possible issue'
 
-                if suggestion['one_sentence_summary'] in one_sentence_summary_list:
+                if suggestion['one_sentence_summary'] in one_sentence_summary_set:
                     get_logger().debug(f"Skipping suggestion {i + 1}, because it is a duplicate: {suggestion}")
                     continue
 
@@ -529,7 +533,7 @@ class PRCodeSuggestions:
 
                 if ('existing_code' in suggestion) and ('improved_code' in suggestion):
                     suggestion = self._truncate_if_needed(suggestion)
-                    one_sentence_summary_list.append(suggestion['one_sentence_summary'])
+                    one_sentence_summary_set.add(suggestion['one_sentence_summary'])
                     suggestion_list.append(suggestion)
                 else:
                     get_logger().info(
@@ -551,9 +555,10 @@ class PRCodeSuggestions:
             else:
                 return self.git_provider.publish_comment('No suggestions found to improve this PR.')
 
+        is_verbose = get_settings().config.verbosity_level >= 2
         for d in data['code_suggestions']:
             try:
-                if get_settings().config.verbosity_level >= 2:
+                if is_verbose:
                     get_logger().info(f"suggestion: {d}")
                 relevant_file = d['relevant_file'].strip()
                 relevant_lines_start = int(d['relevant_lines_start'])  # absolute position
@@ -2,7 +2,7 @@ import asyncio
 import copy
 import re
 import traceback
-from functools import partial
+from functools import lru_cache, partial
 from typing import List, Tuple
 
 import yaml
@@ -29,6 +29,9 @@ from pr_insight.tools.ticket_pr_compliance_check import (
     extract_and_cache_pr_tickets, extract_ticket_links_from_pr_description,
     extract_tickets)
 
+# keys used by 'try_fix_yaml' to repair a malformed description prediction
+DESCRIPTION_KEYS_FIX_YAML = ("filename:", "language:", "changes_summary:", "changes_title:", "description:", "title:")
+
 
 class PRDescription:
     def __init__(self, pr_url: str, args: list = None,
@@ -46,7 +49,7 @@ class PRDescription:
             self.git_provider.get_languages(), self.git_provider.get_files()
         )
         self.pr_id = self.git_provider.get_pr_id()
-        self.keys_fix = ["filename:", "language:", "changes_summary:", "changes_title:", "description:", "title:"]
+        self.keys_fix = DESCRIPTION_KEYS_FIX_YAML
 
         if get_settings().pr_description.enable_semantic_files_types and not self.git_provider.is_supported(
                 "gfm_markdown"):
@@ -211,8 +214,7 @@ class PRDescription:
                 if get_settings().pr_description.enable_semantic_files_types:
                     self.prediction = await self.extend_uncovered_files(self.prediction)
             else:
-                get_logger().error(f"Error getting PR diff {self.pr_id}",
-                                   artifact={"traceback": traceback.format_exc()})
+                get_logger().error(f"Error getting PR diff {self.pr_id}")
                 self.prediction = None
         else:
             # get the diff in multiple patches, with the token handler only for the files prompt
@@ -579,8 +581,7 @@ class PRDescription:
             return file_label_dict
         for file in self.data['pr_files']:
             try:
-                required_fields = ['changes_title', 'filename', 'label']
-                if not all(field in file for field in required_fields):
+                if not ('changes_title' in file and 'filename' in file and 'label' in file):
                     # can happen for example if a YAML generation was interrupted in the middle (no more tokens)
                     get_logger().warning(f"Missing required fields in file label dict {self.pr_id}, skipping file",
                                          artifact={"file": file})
@@ -589,7 +590,7 @@ class PRDescription:
                     get_logger().warning(f"Empty changes title or summary in file label dict {self.pr_id}, skipping file",
                                          artifact={"file": file})
                     continue
-                filename = file['filename'].replace("'", "`").replace('"', '`')
+                filename = file['filename'].replace("'", "`").replace('"', '`').strip()
                 changes_summary = file.get('changes_summary', "").strip()
                 changes_title = file['changes_title'].strip()
                 label = file.get('label').strip().lower()
@@ -631,7 +632,7 @@ class PRDescription:
                 else:
                     pr_body += f"""<td><table>"""
                 for filename, file_changes_title, file_change_description in list_tuples:
-                    filename = filename.replace("'", "`").rstrip()
+                    # filenames are already normalized in '_prepare_file_labels'
                     filename_publish = filename.split("/")[-1]
                     if file_changes_title and file_changes_title.strip() != "...":
                         file_changes_title_code = f"<code>{file_changes_title}</code>"
@@ -657,7 +658,6 @@ class PRDescription:
                     # try to add line numbers link to code suggestions
                     link = ""
                     if hasattr(self.git_provider, 'get_line_link'):
-                        filename = filename.strip()
                         link = self.git_provider.get_line_link(filename, relevant_line_start=-1)
                     if (not link or not diff_plus_minus) and ('additional files' not in filename.lower()):
                         get_logger().warning(f"Error getting line link for '{filename}'")
@@ -714,6 +714,11 @@ class PRDescription:
 """
         return pr_body
 
+
+# HTML tokens that don't count towards the line length in 'insert_br_after_x_chars'
+SAVED_WORDS = frozenset(("<code>", "</code>", "<li>", "<br>"))
+
+
 def count_chars_without_html(string):
     if '<' not in string:
         return len(string)
@@ -721,10 +726,12 @@ def count_chars_without_html(string):
     return len(no_html_string)
 
 
+@lru_cache(maxsize=1024)
 def insert_br_after_x_chars(text: str, x=70):
     """
     Insert <br> into a string after a word that increases its length above x characters.
     Use proper HTML tags for code and new lines.
+    The function is pure, so results are cached for repeated descriptions.
     """
 
     if not text:
@@ -756,9 +763,7 @@ def insert_br_after_x_chars(text: str, x=70):
     is_inside_code = False
     current_length = 0
     for word in words:
-        is_saved_word = False
-        if word == "<code>" or word == "</code>" or word == "<li>" or word == "<br>":
-            is_saved_word = True
+        is_saved_word = word in SAVED_WORDS
 
         len_word = count_chars_without_html(word)
         if not is_saved_word and (current_length + len_word > x):
@@ -1,8 +1,7 @@
-import copy
 import datetime
 import traceback
 from collections import OrderedDict
-from functools import partial
+from functools import lru_cache, partial
 from typing import List, Tuple
 
 from jinja2 import Environment, StrictUndefined
@@ -27,6 +26,21 @@ from pr_insight.servers.help import HelpMessage
 from pr_insight.tools.ticket_pr_compliance_check import (
     extract_and_cache_pr_tickets, extract_tickets)
 
+# keys used by 'try_fix_yaml' to repair a malformed review prediction
+REVIEW_KEYS_FIX_YAML = ("ticket_compliance_check", "estimated_effort_to_review_[1-5]:", "security_concerns:",
+                        "key_issues_to_review:", "relevant_file:", "relevant_line:", "suggestion:")
+
+# prefixes (lowercase) of the labels that are managed by the review tool
+REVIEW_LABEL_PREFIXES = ('review effort [1-5]:', 'possible security concern')
+
+_jinja_environment = Environment(undefined=StrictUndefined)
+
+
+@lru_cache(maxsize=32)
+def _compile_prompt_template(template_source: str):
+    # prompt templates come from the settings and rarely change, so each one is parsed and compiled only once
+    return _jinja_environment.from_string(template_source)
+
 
 class PRReviewer:
     """
@@ -51,9 +65,8 @@ class PRReviewer:
         if self.incremental and self.incremental.is_incremental:
             self.git_provider.get_incremental_commits(self.incremental)
 
-        self.main_language = get_main_pr_language(
-            self.git_provider.get_languages(), self.git_provider.get_files()
-        )
+        languages, files, commit_messages_str = self._fetch_pr_metadata()
+        self.main_language = get_main_pr_language(languages, files)
         self.pr_url = pr_url
         self.is_answer = is_answer
         self.is_auto = is_auto
@@ -67,14 +80,11 @@ class PRReviewer:
         answer_str, question_str = self._get_user_answers()
         self.pr_description, self.pr_description_files = (
             self.git_provider.get_pr_description(split_changes_walkthrough=True))
-        if (self.pr_description_files and get_settings().get("config.is_auto_command", False) and
-                get_settings().get("config.enable_ai_metadata", False)):
-            add_ai_metadata_to_diff_files(self.git_provider, self.pr_description_files)
-            get_logger().debug(f"AI metadata added to the this command")
-        else:
-            get_settings().set("config.enable_ai_metadata", False)
-            get_logger().debug(f"AI metadata is disabled for this command")
+        self._handle_ai_metadata()
 
+        settings = get_settings()
+        pr_reviewer_settings = settings.pr_reviewer
+        config = settings.config
         self.vars = {
             "title": self.git_provider.pr.title,
             "branch": self.git_provider.get_pr_branch(),
@@ -82,29 +92,52 @@ class PRReviewer:
             "language": self.main_language,
             "diff": "",  # empty diff for initial calculation
             "num_pr_files": self.git_provider.get_num_of_files(),
-            "require_score": get_settings().pr_reviewer.require_score_review,
-            "require_tests": get_settings().pr_reviewer.require_tests_review,
-            "require_estimate_effort_to_review": get_settings().pr_reviewer.require_estimate_effort_to_review,
-            'require_can_be_split_review': get_settings().pr_reviewer.require_can_be_split_review,
-            'require_security_review': get_settings().pr_reviewer.require_security_review,
+            "require_score": pr_reviewer_settings.require_score_review,
+            "require_tests": pr_reviewer_settings.require_tests_review,
+            "require_estimate_effort_to_review": pr_reviewer_settings.require_estimate_effort_to_review,
+            'require_can_be_split_review': pr_reviewer_settings.require_can_be_split_review,
+            'require_security_review': pr_reviewer_settings.require_security_review,
             'question_str': question_str,
             'answer_str': answer_str,
-            "extra_instructions": get_settings().pr_reviewer.extra_instructions,
-            "commit_messages_str": self.git_provider.get_commit_messages(),
+            "extra_instructions": pr_reviewer_settings.extra_instructions,
+            "commit_messages_str": commit_messages_str,
             "custom_labels": "",
-            "enable_custom_labels": get_settings().config.enable_custom_labels,
-            "is_ai_metadata":  get_settings().get("config.enable_ai_metadata", False),
-            "related_tickets": get_settings().get('related_tickets', []),
-            'duplicate_prompt_examples': get_settings().config.get('duplicate_prompt_examples', False),
+            "enable_custom_labels": config.enable_custom_labels,
+            "is_ai_metadata": config.get("enable_ai_metadata", False),
+            "related_tickets": settings.get('related_tickets', []),
+            'duplicate_prompt_examples': config.get('duplicate_prompt_examples', False),
         }
 
         self.token_handler = TokenHandler(
             self.git_provider.pr,
             self.vars,
-            get_settings().pr_review_prompt.system,
-            get_settings().pr_review_prompt.user
+            settings.pr_review_prompt.system,
+            settings.pr_review_prompt.user
         )
 
+    def _fetch_pr_metadata(self) -> Tuple[dict, list, str]:
+        """
+        Fetch the PR languages, files and commit messages.
+        The files are fetched first, since some providers cache them and reuse them in 'get_languages'. The calls are
+        sequential, since the provider clients (e.g. PyGithub) are not thread-safe.
+        """
+        files = self.git_provider.get_files()
+        return self.git_provider.get_languages(), files, self.git_provider.get_commit_messages()
+
+    def _handle_ai_metadata(self):
+        """
+        Add the AI metadata from the PR description to the diff files, or disable it for this command.
+        """
+        settings = get_settings()
+        # check the cheapest predicate first
+        if (self.pr_description_files and settings.get("config.is_auto_command", False) and
+                settings.get("config.enable_ai_metadata", False)):
+            add_ai_metadata_to_diff_files(self.git_provider, self.pr_description_files)
+            get_logger().debug(f"AI metadata added to the this command")
+        else:
+            settings.set("config.enable_ai_metadata", False)
+            get_logger().debug(f"AI metadata is disabled for this command")
+
     def parse_incremental(self, args: List[str]):
         is_incremental = False
         if args and len(args) >= 1:
@@ -200,12 +233,11 @@ class PRReviewer:
         Returns:
             A string representing the AI prediction for the pull request review.
         """
-        variables = copy.deepcopy(self.vars)
-        variables["diff"] = self.patches_diff  # update diff
+        # a shallow copy is enough, since rendering the prompts does not mutate nested values
+        variables = {**self.vars, "diff": self.patches_diff}  # update diff
 
-        environment = Environment(undefined=StrictUndefined)
-        system_prompt = environment.from_string(get_settings().pr_review_prompt.system).render(variables)
-        user_prompt = environment.from_string(get_settings().pr_review_prompt.user).render(variables)
+        system_prompt = _compile_prompt_template(get_settings().pr_review_prompt.system).render(variables)
+        user_prompt = _compile_prompt_template(get_settings().pr_review_prompt.user).render(variables)
 
         response, finish_reason = await self.ai_handler.chat_completion(
             model=model,
@@ -221,12 +253,9 @@ class PRReviewer:
         Prepare the PR review by processing the AI prediction and generating a markdown-formatted text that summarizes
         the feedback.
         """
-        first_key = 'review'
-        last_key = 'security_concerns'
         data = load_yaml(self.prediction.strip(),
-                         keys_fix_yaml=["ticket_compliance_check", "estimated_effort_to_review_[1-5]:", "security_concerns:", "key_issues_to_review:",
-                                        "relevant_file:", "relevant_line:", "suggestion:"],
-                         first_key=first_key, last_key=last_key)
+                         keys_fix_yaml=REVIEW_KEYS_FIX_YAML,
+                         first_key='review', last_key='security_concerns')
         github_action_output(data, 'review')
 
         # move data['review'] 'key_issues_to_review' key to the end of the dictionary
@@ -359,45 +388,52 @@ class PRReviewer:
                 get_settings().pr_reviewer.enable_review_labels_effort):
             try:
                 review_labels = []
+                # whether the prediction determined any label state. A 'no' security answer still counts, since it
+                # should remove a stale 'Possible security concern' label
+                has_labels_decision = False
                 if get_settings().pr_reviewer.enable_review_labels_effort:
                     estimated_effort = data['review']['estimated_effort_to_review_[1-5]']
-                    estimated_effort_number = 0
-                    if isinstance(estimated_effort, str):
-                        try:
-                            estimated_effort_number = int(estimated_effort.split(',')[0])
-                        except ValueError:
-                            get_logger().warning(f"Invalid estimated_effort value: {estimated_effort}")
-                    elif isinstance(estimated_effort, int):
-                        estimated_effort_number = estimated_effort
-                    else:
-                        get_logger().warning(f"Unexpected type for estimated_effort: {type(estimated_effort)}")
+                    estimated_effort_number = self._parse_effort_value(estimated_effort)
                     if 1 <= estimated_effort_number <= 5:  # 1, because ...
                         review_labels.append(f'Review effort [1-5]: {estimated_effort_number}')
+                        has_labels_decision = True
                 if get_settings().pr_reviewer.enable_review_labels_security and get_settings().pr_reviewer.require_security_review:
                     security_concerns = data['review']['security_concerns']  # yes, because ...
                     security_concerns_bool = 'yes' in security_concerns.lower() or 'true' in security_concerns.lower()
                     if security_concerns_bool:
                         review_labels.append('Possible security concern')
+                    has_labels_decision = True
+
+                if not has_labels_decision:
+                    get_logger().info("No valid review labels in the prediction, not updating labels")
+                    return
 
                 current_labels = self.git_provider.get_pr_labels(update=True)
                 if not current_labels:
                     current_labels = []
                 get_logger().debug(f"Current labels:\n{current_labels}")
-                if current_labels:
-                    current_labels_filtered = [label for label in current_labels if
-                                               not label.lower().startswith('review effort [1-5]:') and not label.lower().startswith(
-                                                   'possible security concern')]
-                else:
-                    current_labels_filtered = []
+                current_labels_filtered = [label for label in current_labels if
+                                           not label.lower().startswith(REVIEW_LABEL_PREFIXES)]
                 new_labels = review_labels + current_labels_filtered
-                if (current_labels or review_labels) and sorted(new_labels) != sorted(current_labels):
-                    get_logger().info(f"Setting review labels:\n{review_labels + current_labels_filtered}")
+                if (current_labels or review_labels) and set(new_labels) != set(current_labels):
+                    get_logger().info(f"Setting review labels:\n{new_labels}")
                     self.git_provider.publish_labels(new_labels)
                 else:
-                    get_logger().info(f"Review labels are already set:\n{review_labels + current_labels_filtered}")
+                    get_logger().info(f"Review labels are already set:\n{new_labels}")
             except Exception as e:
                 get_logger().error(f"Failed to set review labels, error: {e}")
 
+    @staticmethod
+    def _parse_effort_value(estimated_effort) -> int:
+        """
+        Parse the estimated effort to review (e.g. '3, because ...') into an int. Returns 0 if the value is invalid.
+        """
+        try:
+            return int(str(estimated_effort).partition(',')[0])
+        except (ValueError, TypeError):
+            get_logger().warning(f"Invalid estimated_effort value: {estimated_effort!r}")
+            return 0
+
     def auto_approve_logic(self):
         """
         Auto-approve a pull request if it meets the conditions for auto-approval.
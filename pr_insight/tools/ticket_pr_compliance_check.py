@@ -1,25 +1,26 @@
 import re
 import traceback
+from functools import lru_cache
 
 from pr_insight.config_loader import get_settings
 from pr_insight.git_providers import GithubProvider
 from pr_insight.log import get_logger
 
-# Compile the regex pattern once, outside the function
+# Compile the regex patterns once, outside the functions
 GITHUB_TICKET_PATTERN = re.compile(
      r'(https://github[^/]+/[^/]+/[^/]+/issues/\d+)|(\b(\w+)/(\w+)#(\d+)\b)|(#\d+)'
 )
+JIRA_TICKET_PATTERNS = (
+    re.compile(r'\b[A-Z]{2,10}-\d{1,7}\b'),  # Standard JIRA ticket format (e.g., PROJ-123)
+    re.compile(r'(?:https?://[^\s/]+/browse/)?([A-Z]{2,10}-\d{1,7})\b')  # JIRA URL or just the ticket
+)
+MAX_TICKET_CHARACTERS = 10000
 
-def find_jira_tickets(text):
-    # Regular expression patterns for JIRA tickets
-    patterns = [
-        r'\b[A-Z]{2,10}-\d{1,7}\b',  # Standard JIRA ticket format (e.g., PROJ-123)
-        r'(?:https?://[^\s/]+/browse/)?([A-Z]{2,10}-\d{1,7})\b'  # JIRA URL or just the ticket
-    ]
 
+def find_jira_tickets(text):
     tickets = set()
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    for pattern in JIRA_TICKET_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             if isinstance(match, tuple):
                 # If it's a tuple (from the URL pattern), take the last non-empty group
@@ -36,30 +37,37 @@ def extract_ticket_links_from_pr_description(pr_description, repo_path, base_url
     """
     Extract all ticket links from PR description
     """
-    github_tickets = set()
     try:
-        # Use the updated pattern to find matches
-        matches = GITHUB_TICKET_PATTERN.findall(pr_description)
-
-        for match in matches:
-            if match[0]:  # Full URL match
-                github_tickets.add(match[0])
-            elif match[1]:  # Shorthand notation match: owner/repo#issue_number
-                owner, repo, issue_number = match[2], match[3], match[4]
-                github_tickets.add(f'{base_url_html.strip("/")}/{owner}/{repo}/issues/{issue_number}')
-            else:  # #123 format
-                issue_number = match[5][1:]  # remove #
-                if issue_number.isdigit() and len(issue_number) < 5 and repo_path:
-                    github_tickets.add(f'{base_url_html.strip("/")}/{repo_path}/issues/{issue_number}')
+        return list(_extract_ticket_links(pr_description, repo_path, base_url_html))
     except Exception as e:
         get_logger().error(f"Error extracting tickets error= {e}",
                            artifact={"traceback": traceback.format_exc()})
+        return []
+
+
+@lru_cache(maxsize=512)
+def _extract_ticket_links(pr_description, repo_path, base_url_html):
+    # the same PR description is scanned by several tools (review, describe, improve), so the result is memoized.
+    # errors are raised to the caller, so that a failed extraction is not cached
+    github_tickets = set()
+    # Use the updated pattern to find matches
+    matches = GITHUB_TICKET_PATTERN.findall(pr_description)
+
+    for match in matches:
+        if match[0]:  # Full URL match
+            github_tickets.add(match[0])
+        elif match[1]:  # Shorthand notation match: owner/repo#issue_number
+            owner, repo, issue_number = match[2], match[3], match[4]
+            github_tickets.add(f'{base_url_html.strip("/")}/{owner}/{repo}/issues/{issue_number}')
+        else:  # #123 format
+            issue_number = match[5][1:]  # remove #
+            if issue_number.isdigit() and len(issue_number) < 5 and repo_path:
+                github_tickets.add(f'{base_url_html.strip("/")}/{repo_path}/issues/{issue_number}')
 
-    return list(github_tickets)
+    return tuple(github_tickets)
 
 
 async def extract_tickets(git_provider):
-    MAX_TICKET_CHARACTERS = 10000
     try:
         if isinstance(git_provider, GithubProvider):
             user_description = git_provider.get_user_description()
@@ -79,11 +87,9 @@ async def extract_tickets(git_provider):
                         continue
 
                     # clip issue_main.body max length
-                    issue_body_str = issue_main.body
-                    if not issue_body_str:
-                        issue_body_str = ""
+                    issue_body_str = issue_main.body or ""
                     if len(issue_body_str) > MAX_TICKET_CHARACTERS:
-                        issue_body_str = issue_body_str[:MAX_TICKET_CHARACTERS] + "..."
+                        issue_body_str = f"{issue_body_str[:MAX_TICKET_CHARACTERS]}..."
 
                     # extract labels
                     labels = []
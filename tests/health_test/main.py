@@ -1,7 +1,9 @@
 import argparse
 import asyncio
+import contextlib
 import copy
 import os
+import re
 from pathlib import Path
 
 from starlette_context import context, request_cycle_context
@@ -15,55 +17,89 @@ from tests.e2e_tests import e2e_utils
 log_level = os.environ.get("LOG_LEVEL", "INFO")
 setup_logger(log_level)
 
+# settings overridden for the health test
+HEALTH_TEST_SETTINGS = {
+    "config.git_provider": "github",
+    "config.publish_output": False,
+    "config.fallback_models": [],
+}
 
-async def run_async():
+# (command, pattern that the start of the command output must match)
+HEALTH_TEST_COMMANDS = (
+    ("describe", re.compile(r"###(?=.*?PR Type)(?=.*?Description)", re.S)),
+    ("review", re.compile(r"##.*?PR Reviewer Guide", re.S)),
+    ("improve", re.compile(r"##.*?PR Code Suggestions", re.S)),
+)
+
+
+def _snapshot_keys(settings, keys):
+    return {key: copy.deepcopy(settings.get(key)) for key in keys}
+
+
+def _restore_keys(settings, snapshot):
+    for key, value in snapshot.items():
+        settings.set(key, value)
+
+
+async def _run_one(insight, pr_url, command, output_pattern):
+    # each command runs in its own request context, with its own copy of the settings, so the concurrent commands
+    # don't interfere with each other
+    base_settings = get_settings()
+    with request_cycle_context({}):
+        context['settings'] = copy.deepcopy(base_settings)
+        get_logger().info(f"\nSanity check for the '{command}' command...")
+        await insight.handle_request(pr_url, [command])
+        output_body = get_settings().data['artifact']
+        assert output_pattern.match(output_body)
+        get_logger().info(f"'{command}' output generated successfully\n")
+
+
+async def run_async(insight: PRInsight = None):
     pr_url = os.getenv('TEST_PR_URL', 'https://github.com/khulnasoft/pr-insight/pull/1385')
+    settings = get_settings()
+    logger = get_logger()
 
-    get_settings().set("config.git_provider", "github")
-    get_settings().set("config.publish_output", False)
-    get_settings().set("config.fallback_models", [])
+    # only the overridden keys are saved and restored, instead of copying the whole settings object
+    settings_snapshot = _snapshot_keys(settings, HEALTH_TEST_SETTINGS)
+    for key, value in HEALTH_TEST_SETTINGS.items():
+        settings.set(key, value)
 
-    insight = PRInsight()
+    # PRInsight holds no per-request state, so a single instance is shared by all the commands
+    if insight is None:
+        insight = PRInsight()
     try:
-        # Run the 'describe' command
-        get_logger().info(f"\nSanity check for the 'describe' command...")
-        original_settings = copy.deepcopy(get_settings())
-        await insight.handle_request(pr_url, ['describe'])
-        pr_header_body = dict(get_settings().data)['artifact']
-        assert pr_header_body.startswith('###') and 'PR Type' in pr_header_body and 'Description' in pr_header_body
-        context['settings'] = copy.deepcopy(original_settings) # Restore settings state after each test to prevent test interference
-        get_logger().info("PR description generated successfully\n")
-
-        # Run the 'review' command
-        get_logger().info(f"\nSanity check for the 'review' command...")
-        original_settings = copy.deepcopy(get_settings())
-        await insight.handle_request(pr_url, ['review'])
-        pr_review_body = dict(get_settings().data)['artifact']
-        assert pr_review_body.startswith('##') and 'PR Reviewer Guide' in pr_review_body
-        context['settings'] = copy.deepcopy(original_settings)  # Restore settings state after each test to prevent test interference
-        get_logger().info("PR review generated successfully\n")
-
-        # Run the 'improve' command
-        get_logger().info(f"\nSanity check for the 'improve' command...")
-        original_settings = copy.deepcopy(get_settings())
-        await insight.handle_request(pr_url, ['improve'])
-        pr_improve_body = dict(get_settings().data)['artifact']
-        assert pr_improve_body.startswith('##') and 'PR Code Suggestions' in pr_improve_body
-        context['settings'] = copy.deepcopy(original_settings)  # Restore settings state after each test to prevent test interference
-        get_logger().info("PR improvements generated successfully\n")
-
-        get_logger().info(f"\n\n========\nHealth test passed successfully\n========")
+        # the commands are independent, so run them concurrently
+        await asyncio.gather(*(_run_one(insight, pr_url, command, output_pattern)
+                               for command, output_pattern in HEALTH_TEST_COMMANDS))
+
+        logger.info(f"\n\n========\nHealth test passed successfully\n========")
 
     except Exception as e:
-        get_logger().exception(f"\n\n========\nHealth test failed\n========")
+        logger.exception(f"\n\n========\nHealth test failed\n========")
         raise e
+    finally:
+        _restore_keys(settings, settings_snapshot)
 
 
-def run():
+@contextlib.contextmanager
+def _health_ctx():
     with request_cycle_context({}):
-        context['settings'] = copy.deepcopy(global_settings)
+        # no copy is needed here: run_async restores the keys it overrides, and every command gets its own copy
+        context['settings'] = global_settings
+        yield
+
+
+def run():
+    with _health_ctx():
         asyncio.run(run_async())
 
 
+def run_many(times: int):
+    # programmatic entry point (e.g. benchmarks): all the runs share one request context
+    with _health_ctx():
+        for _ in range(times):
+            asyncio.run(run_async())
+
+
 if __name__ == '__main__':
     run()
@@ -1,11 +1,82 @@
-from unittest.mock import patch
+import time
+from collections import Counter
 
 import pytest
 
 from pr_insight.algo.types import EDIT_TYPE, FilePatchInfo
+from pr_insight.git_providers.codecommit_client import \
+    CodeCommitDifferencesResponse
 from pr_insight.git_providers.codecommit_provider import (CodeCommitFile,
                                                           CodeCommitProvider,
                                                           PullRequestCCMimic)
+from pr_insight.tools.pr_reviewer import PRReviewer
+
+VALID_REGIONS = (
+    "af-south-1",
+    "ap-east-1",
+    "ap-northeast-1",
+    "ap-northeast-2",
+    "ap-northeast-3",
+    "ap-south-1",
+    "ap-south-2",
+    "ap-southeast-1",
+    "ap-southeast-2",
+    "ap-southeast-3",
+    "ap-southeast-4",
+    "ca-central-1",
+    "eu-central-1",
+    "eu-central-2",
+    "eu-north-1",
+    "eu-south-1",
+    "eu-south-2",
+    "eu-west-1",
+    "eu-west-2",
+    "eu-west-3",
+    "il-central-1",
+    "me-central-1",
+    "me-south-1",
+    "sa-east-1",
+    "us-east-1",
+    "us-east-2",
+    "us-gov-east-1",
+    "us-gov-west-1",
+    "us-west-1",
+    "us-west-2",
+)
+
+INVALID_HOSTNAMES = (
+    "no-such-region.console.aws.amazon.com",
+    "console.aws.amazon.com",
+)
+
+FILENAMES = (
+    "app.py",
+    "cli.py",
+    "composer.json",
+    "composer.lock",
+    "hello.py",
+    "image1.jpg",
+    "image2.JPG",
+    "index.js",
+    "provider.py",
+    "README",
+    "test.py",
+)
+
+# The extensions expected from FILENAMES, in the same order
+FILE_EXTENSIONS = [
+    ".py",
+    ".py",
+    ".json",
+    ".lock",
+    ".py",
+    ".jpg",
+    ".jpg",
+    ".js",
+    ".py",
+    "",
+    ".py",
+]
 
 
 class TestCodeCommitFile:
@@ -31,18 +102,16 @@ class TestCodeCommitFile:
 class TestCodeCommitProvider:
     def test_get_title(self):
         # Test that the get_title() function returns the PR title
-        with patch.object(CodeCommitProvider, "__init__", lambda x, y: None):
-            provider = CodeCommitProvider(None)
-            provider.pr = PullRequestCCMimic("My Test PR Title", [])
-            assert provider.get_title() == "My Test PR Title"
+        provider = CodeCommitProvider.__new__(CodeCommitProvider)  # skip __init__
+        provider.pr = PullRequestCCMimic("My Test PR Title", [])
+        assert provider.get_title() == "My Test PR Title"
 
     def test_get_pr_id(self):
         # Test that the get_pr_id() function returns the correct ID
-        with patch.object(CodeCommitProvider, "__init__", lambda x, y: None):
-            provider = CodeCommitProvider(None)
-            provider.repo_name = "my_test_repo"
-            provider.pr_num = 321
-            assert provider.get_pr_id() == "my_test_repo/321"
+        provider = CodeCommitProvider.__new__(CodeCommitProvider)  # skip __init__
+        provider.repo_name = "my_test_repo"
+        provider.pr_num = 321
+        assert provider.get_pr_id() == "my_test_repo/321"
 
     def test_parse_pr_url(self):
         # Test that the _parse_pr_url() function can extract the repo name and PR number from a CodeCommit URL
@@ -51,41 +120,15 @@ class TestCodeCommitProvider:
         assert repo_name == "my_test_repo"
         assert pr_number == 321
 
-    def test_is_valid_codecommit_hostname(self):
+    @pytest.mark.parametrize("region", VALID_REGIONS)
+    def test_is_valid_codecommit_hostname(self, region):
         # Test the various AWS regions
-        assert CodeCommitProvider._is_valid_codecommit_hostname("af-south-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-east-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-northeast-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-northeast-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-northeast-3.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-south-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-south-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-southeast-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-southeast-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-southeast-3.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ap-southeast-4.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("ca-central-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-central-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-central-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-north-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-south-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-south-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-west-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-west-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("eu-west-3.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("il-central-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("me-central-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("me-south-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("sa-east-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("us-east-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("us-east-2.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("us-gov-east-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("us-gov-west-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("us-west-1.console.aws.amazon.com")
-        assert CodeCommitProvider._is_valid_codecommit_hostname("us-west-2.console.aws.amazon.com")
+        assert CodeCommitProvider._is_valid_codecommit_hostname(f"{region}.console.aws.amazon.com")
+
+    @pytest.mark.parametrize("hostname", INVALID_HOSTNAMES)
+    def test_is_invalid_codecommit_hostname(self, hostname):
         # Test non-AWS regions
-        assert not CodeCommitProvider._is_valid_codecommit_hostname("no-such-region.console.aws.amazon.com")
-        assert not CodeCommitProvider._is_valid_codecommit_hostname("console.aws.amazon.com")
+        assert not CodeCommitProvider._is_valid_codecommit_hostname(hostname)
 
     # Test that an error is raised when an invalid CodeCommit URL is provided to the set_pr() method of the CodeCommitProvider class.
     # Generated by KhulnaSoft
@@ -95,56 +138,16 @@ class TestCodeCommitProvider:
             provider.set_pr("https://example.com/codecommit/repositories/my_test_repo/pull-requests/4321")
 
     def test_get_file_extensions(self):
-        filenames = [
-            "app.py",
-            "cli.py",
-            "composer.json",
-            "composer.lock",
-            "hello.py",
-            "image1.jpg",
-            "image2.JPG",
-            "index.js",
-            "provider.py",
-            "README",
-            "test.py",
-        ]
-        expected_extensions = [
-            ".py",
-            ".py",
-            ".json",
-            ".lock",
-            ".py",
-            ".jpg",
-            ".jpg",
-            ".js",
-            ".py",
-            "",
-            ".py",
-        ]
-        extensions = CodeCommitProvider._get_file_extensions(filenames)
-        assert extensions == expected_extensions
+        extensions = CodeCommitProvider._get_file_extensions(FILENAMES)
+        assert extensions == FILE_EXTENSIONS
 
     def test_get_language_percentages(self):
-        extensions = [
-            ".py",
-            ".py",
-            ".json",
-            ".lock",
-            ".py",
-            ".jpg",
-            ".jpg",
-            ".js",
-            ".py",
-            "",
-            ".py",
-        ]
-        percentages = CodeCommitProvider._get_language_percentages(extensions)
-        assert percentages[".py"] == 45
-        assert percentages[".json"] == 9
-        assert percentages[".lock"] == 9
-        assert percentages[".jpg"] == 18
-        assert percentages[".js"] == 9
-        assert percentages[""] == 9
+        extension_counts = Counter(FILE_EXTENSIONS)
+        expected_percentages = {
+            ext: round(count * 100 / len(FILE_EXTENSIONS)) for ext, count in extension_counts.items()
+        }
+        percentages = CodeCommitProvider._get_language_percentages(FILE_EXTENSIONS)
+        assert percentages == expected_percentages
 
         # The _get_file_extensions function needs the "." prefix on the extension,
         # but the _get_language_percentages function will work with or without the "." prefix
@@ -189,3 +192,25 @@ class TestCodeCommitProvider:
         input = "## PR Feedback\n<details><summary>Code feedback:</summary>\nfile foo\n</summary>\n"
         expect = "## PR Feedback\nCode feedback:\nfile foo\n\n"
         assert CodeCommitProvider._remove_markdown_html(input) == expect
+
+    def test_fetch_pr_metadata_does_not_duplicate_files(self):
+        # get_languages() calls get_files() too, so fetching the PR metadata must not fetch the files twice at once
+        class SlowCodeCommitClient:
+            def get_differences(self, repo_name, destination_commit, source_commit):
+                time.sleep(0.05)
+                return [CodeCommitDifferencesResponse({"afterBlob": {"blobId": str(i), "path": f"file{i}.py"},
+                                                       "changeType": "A"}) for i in range(3)]
+
+        provider = CodeCommitProvider.__new__(CodeCommitProvider)  # skip __init__
+        provider.codecommit_client = SlowCodeCommitClient()
+        provider.repo_name = "my_test_repo"
+        provider.pr = PullRequestCCMimic("My Test PR Title", [])
+        provider.git_files = None
+        reviewer = PRReviewer.__new__(PRReviewer)  # skip __init__
+        reviewer.git_provider = provider
+
+        languages, files, commit_messages_str = reviewer._fetch_pr_metadata()
+        assert [file.filename for file in files] == ["file0.py", "file1.py", "file2.py"]
+        assert provider.git_files == files
+        assert languages == {"python": 100}
+        assert commit_messages_str == ""
@@ -1,4 +1,9 @@
 # Generated by KhulnaSoft
+import json
+from pathlib import Path
+
+import pytest
+
 from pr_insight.algo.utils import PRReviewHeader, convert_to_markdown_v2
 from pr_insight.tools.pr_description import insert_br_after_x_chars
 
@@ -41,18 +46,24 @@ Additional aspects:
 - The function uses emojis to add visual cues to the markdown text.
 """
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
-class TestConvertToMarkdown:
-    # Tests that the function works correctly with a simple dictionary input
-    def test_simple_dictionary_input(self):
-        input_data = {'review': {
-            'estimated_effort_to_review_[1-5]': '1, because the changes are minimal and straightforward, focusing on a single functionality addition.\n',
-            'relevant_tests': 'No\n', 'possible_issues': 'No\n', 'security_concerns': 'No\n'}}
 
+@pytest.fixture(scope="session")
+def simple_review_input():
+    return json.loads((FIXTURES_DIR / "simple_review.json").read_text(encoding="utf-8"))
 
-        expected_output = f'{PRReviewHeader.REGULAR.value} 🔍\n\nHere are some key observations to aid the review process:\n\n<table>\n<tr><td>⏱️&nbsp;<strong>Estimated effort to review</strong>: 1 🔵⚪⚪⚪⚪</td></tr>\n<tr><td>🧪&nbsp;<strong>No relevant tests</strong></td></tr>\n<tr><td>&nbsp;<strong>Possible issues</strong>: No\n</td></tr>\n<tr><td>🔒&nbsp;<strong>No security concerns identified</strong></td></tr>\n</table>'
 
-        assert convert_to_markdown_v2(input_data).strip() == expected_output.strip()
+@pytest.fixture(scope="session")
+def simple_review_expected_output():
+    expected_output = (FIXTURES_DIR / "simple_review_expected.md").read_text(encoding="utf-8")
+    return expected_output.replace("{header}", PRReviewHeader.REGULAR.value, 1)
+
+
+class TestConvertToMarkdown:
+    # Tests that the function works correctly with a simple dictionary input
+    def test_simple_dictionary_input(self, simple_review_input, simple_review_expected_output):
+        assert convert_to_markdown_v2(simple_review_input).strip() == simple_review_expected_output.strip()
 
     # Tests that the function works correctly with an empty dictionary input
     def test_empty_dictionary_input(self):
@@ -72,33 +83,20 @@ class TestConvertToMarkdown:
         assert convert_to_markdown_v2(input_data).strip() == expected_output.strip()
 
 class TestBR:
-    def test_br1(self):
-        file_change_description = '- Imported `FilePatchInfo` and `EDIT_TYPE` from `pr_insight.algo.types` instead of `pr_insight.git_providers.git_provider`.'
-        file_change_description_br = insert_br_after_x_chars(file_change_description)
-        expected_output = ('<li>Imported <code>FilePatchInfo</code> and <code>EDIT_TYPE</code> from '
-                           '<code>pr_insight.algo.types</code> <br>instead of '
-                           '<code>pr_insight.git_providers.git_provider</code>.')
-        assert file_change_description_br == expected_output
-        # print("-----")
-        # print(file_change_description_br)
-
-    def test_br2(self):
-        file_change_description = (
-            '- Created a - new -class `ColorPaletteResourcesCollection ColorPaletteResourcesCollection '
-            'ColorPaletteResourcesCollection ColorPaletteResourcesCollection`')
-        file_change_description_br = insert_br_after_x_chars(file_change_description)
-        expected_output = ('<li>Created a - new -class <code>ColorPaletteResourcesCollection </code><br><code>'
-                           'ColorPaletteResourcesCollection ColorPaletteResourcesCollection '
-                           '</code><br><code>ColorPaletteResourcesCollection</code>')
-        assert file_change_description_br == expected_output
-        # print("-----")
-        # print(file_change_description_br)
-
-    def test_br3(self):
-        file_change_description = 'Created a new class `ColorPaletteResourcesCollection` which extends `AvaloniaDictionary<ThemeVariant, ColorPaletteResources>` and implements aaa'
-        file_change_description_br = insert_br_after_x_chars(file_change_description)
-        assert file_change_description_br == ('Created a new class <code>ColorPaletteResourcesCollection</code> which '
-                                              'extends <br><code>AvaloniaDictionary<ThemeVariant, ColorPaletteResources>'
-                                              '</code> and implements <br>aaa')
-        # print("-----")
-        # print(file_change_description_br)
+    @pytest.mark.parametrize("file_change_description, expected_output", [
+        ('- Imported `FilePatchInfo` and `EDIT_TYPE` from `pr_insight.algo.types` instead of `pr_insight.git_providers.git_provider`.',
+         '<li>Imported <code>FilePatchInfo</code> and <code>EDIT_TYPE</code> from '
+         '<code>pr_insight.algo.types</code> <br>instead of '
+         '<code>pr_insight.git_providers.git_provider</code>.'),
+        ('- Created a - new -class `ColorPaletteResourcesCollection ColorPaletteResourcesCollection '
+         'ColorPaletteResourcesCollection ColorPaletteResourcesCollection`',
+         '<li>Created a - new -class <code>ColorPaletteResourcesCollection </code><br><code>'
+         'ColorPaletteResourcesCollection ColorPaletteResourcesCollection '
+         '</code><br><code>ColorPaletteResourcesCollection</code>'),
+        ('Created a new class `ColorPaletteResourcesCollection` which extends `AvaloniaDictionary<ThemeVariant, ColorPaletteResources>` and implements aaa',
+         'Created a new class <code>ColorPaletteResourcesCollection</code> which '
+         'extends <br><code>AvaloniaDictionary<ThemeVariant, ColorPaletteResources>'
+         '</code> and implements <br>aaa'),
+    ])
+    def test_br(self, file_change_description, expected_output):
+        assert insert_br_after_x_chars(file_change_description) == expected_output
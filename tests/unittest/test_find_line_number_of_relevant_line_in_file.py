@@ -27,6 +27,29 @@ class TestFindLineNumberOfRelevantLineInFile:
         expected = (2, 1)
         assert find_line_number_of_relevant_line_in_file(diff_files, relevant_file, relevant_line_in_file) == expected
 
+    # Tests that an exact copy of a patch line is found even when other patch lines are similar to it
+    def test_exact_line_found_among_similar_lines(self):
+        diff_files = [
+            FilePatchInfo(base_file='file1', head_file='file1', patch='@@ -1,2 +1,2 @@\n-relevant_line in file similar match\n+relevant_line in file similar matcH\n+relevant_line in file similar match\n', filename='file1')
+        ]
+        relevant_file = 'file1'
+        relevant_line_in_file = '+relevant_line in file similar match'
+        expected = (3, 2)
+        assert find_line_number_of_relevant_line_in_file(diff_files, relevant_file, relevant_line_in_file) == expected
+
+    # Tests that a long line (200+ characters) with small differences is still found using difflib
+    def test_similar_long_line_found_using_difflib(self):
+        long_line = ("+    self.assertEqual(response.status_code, 200); "
+                     "self.assertEqual(response.json()['items'][0]['name'], 'first item'); "
+                     "self.assertEqual(response.json()['items'][1]['name'], 'second item')  # verify the items")
+        diff_files = [
+            FilePatchInfo(base_file='file1', head_file='file1', patch=f'@@ -1,1 +1,2 @@\n-line1\n{long_line}\n', filename='file1')
+        ]
+        relevant_file = 'file1'
+        relevant_line_in_file = long_line.replace('200)', '200z').replace('assertEqual(response.json', 'assertEqyal(response.json', 1)
+        expected = (2, 1)
+        assert find_line_number_of_relevant_line_in_file(diff_files, relevant_file, relevant_line_in_file) == expected
+
     # Tests that the function returns (-1, -1) when the relevant line is not found in the patch and no similar line is found using difflib
     def test_relevant_line_not_found(self):
         diff_files = [
@@ -50,3 +50,12 @@ class TestGitHubOutput:
         github_action_output(output_data, key_name)
 
         assert not os.path.exists(str(tmp_path / 'output'))
+
+    def test_github_action_output_empty_data(self, monkeypatch, tmp_path):
+        get_settings().set('GITHUB_ACTION_CONFIG.ENABLE_OUTPUT', True)
+        monkeypatch.setenv('GITHUB_OUTPUT', str(tmp_path / 'output'))
+
+        github_action_output({}, 'key1')
+
+        assert not os.path.exists(str(tmp_path / 'output'))
+        get_settings().set('GITHUB_ACTION_CONFIG.ENABLE_OUTPUT', False)
@@ -70,3 +70,12 @@ class TestHandlePatchDeletions:
         expected_patch = '--- a/file.py\n+++ b/file.py\n@@ -1,2 +1,2 @@\n-foo\n-bar'
         assert handle_patch_deletions(patch, original_file_content_str, new_file_content_str,
                                       file_name) == expected_patch
+
+    # Tests that handle_patch_deletions omits every hunk of a patch without any added lines
+    def test_handle_patch_deletions_edge_case_no_added_lines(self):
+        patch = '@@ -1,2 +1,0 @@\n-foo\n-bar\n@@ -5,1 +3,0 @@\n-baz\n'
+        original_file_content_str = 'foo\nbar\nqux\nquux\nbaz\n'
+        new_file_content_str = 'qux\nquux\n'
+        file_name = 'file.py'
+        assert handle_patch_deletions(patch, original_file_content_str, new_file_content_str,
+                                      file_name) == ''
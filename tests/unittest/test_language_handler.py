@@ -1,7 +1,9 @@
 
 # Generated by KhulnaSoft
 
-from pr_insight.algo.language_handler import sort_files_by_main_languages
+from pr_insight.algo.language_handler import (get_extension_to_language_map,
+                                               get_language_extension_map,
+                                               sort_files_by_main_languages)
 
 """
 Code Analysis
@@ -121,3 +123,28 @@ class TestSortFilesByMainLanguages:
             {'language': 'Other', 'files': []}
         ]
         assert sort_files_by_main_languages(languages, files) == expected_output
+
+    # Tests that only the top_k largest languages are treated as main languages
+    def test_top_k_languages(self):
+        languages = {'Java': 5, 'Python': 10, 'C++': 3}
+        files = [
+            type('', (object,), {'filename': 'file1.py'})(),
+            type('', (object,), {'filename': 'file2.java'})(),
+            type('', (object,), {'filename': 'file3.cpp'})(),
+        ]
+        expected_output = [
+            {'language': 'Python', 'files': [files[0]]},
+            {'language': 'Java', 'files': [files[1]]},
+            {'language': 'Other', 'files': [files[2]]}
+        ]
+        assert sort_files_by_main_languages(languages, files, top_k=2) == expected_output
+        assert sort_files_by_main_languages(languages, files, top_k=3) == sort_files_by_main_languages(languages, files)
+
+
+class TestLanguageExtensionMaps:
+    # Tests that the derived maps are built once per settings object and use lowercase language names
+    def test_maps_are_cached(self):
+        language_extension_map = get_language_extension_map()
+        assert language_extension_map is get_language_extension_map()
+        assert '.py' in language_extension_map['python']
+        assert get_extension_to_language_map()['.java'] == 'java'